@@ -0,0 +1,28 @@
+"""Compilation anticipée (AOT) du noyau de simulation avec numba.pycc
+
+Produit un module d'extension `isra_kernels` que Isra.py importe en
+priorité: le coût de compilation JIT au premier appel disparaît alors
+complètement. À lancer une fois après installation de numba:
+
+    python aot_build.py
+"""
+import numpy as np
+from numba.pycc import CC
+
+cc = CC('isra_kernels')
+
+
+@cc.export('simulate_all', 'f8[:,:](f8[:], f8[:], f8[:,:], f8[:,:])')
+def simulate_all(bases, growths, mult, noise):
+    """Même noyau que Isra._simulate_all: toute la matrice en un passage"""
+    n, k = mult.shape
+    out = np.empty((n, k))
+    for i in range(n):
+        for j in range(k):
+            out[i, j] = bases[j] * (1.0 + growths[j] * i) * mult[i, j] * noise[i, j]
+    return out
+
+
+if __name__ == '__main__':
+    cc.compile()
+    print('✅ isra_kernels compilé')